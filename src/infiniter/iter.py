@@ -1,7 +1,10 @@
+import bisect
 import itertools
 import typing
 import functools
 import math
+import operator
+import textwrap
 
 
 class SupportsRichComparison(typing.Protocol):
@@ -20,6 +23,188 @@ class InfiniteIteratorError(Exception):
     pass
 
 
+@functools.cache
+def _numpy():
+    """Return the numpy module, imported on first use, or None when it is not installed"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@functools.cache
+def _numba():
+    """Return the numba module, imported on first use, or None when it is not installed"""
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba
+
+
+def _fib_pair(n: int) -> tuple[int, int]:
+    """Return (F(n), F(n + 1)) using fast doubling, one step per bit of n from the top"""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        a, b = a * (2 * b - a), a * a + b * b
+        if bit == "1":
+            a, b = b, a + b
+    return a, b
+
+
+@functools.lru_cache
+def _compile_pipeline(kinds: tuple[str, ...]) -> typing.Callable:
+    """Generate a generator function running each element through the stages in straight-line code.
+
+    The stage functions are passed in as f0, f1, ..., so one compiled function
+    serves every pipeline with the same sequence of stage kinds
+    """
+    names = [f"f{index}" for index in range(len(kinds))]
+    body = []
+    for name, kind in zip(names, kinds):
+        if kind == "map":
+            body.append(f"x = {name}(x)")
+        elif kind == "filter":
+            body.append(f"if not {name}(x): continue")
+        else:
+            body.append(f"x = {name}(x)")
+            body.append("if x is None: continue")
+
+    source = textwrap.dedent("""
+        def run(source, {names}):
+            for x in source:
+                {body}
+                yield x
+        """).format(names=", ".join(names), body="\n        ".join(body))
+    namespace = {}
+    exec(source, namespace)
+    return namespace["run"]
+
+
+_NESTED_STAGES_MAX = 2
+"""Longest run of map/filter stages run as nested builtin map/filter instead of generated code"""
+
+
+def _pipeline(
+    source: typing.Iterator, ops: list[tuple[str, typing.Callable]]
+) -> typing.Iterator:
+    """Return an iterator running every element of source through the stages in ops.
+
+    Short runs of map/filter nest the builtin map and filter, which stay in C between
+    stages. Longer chains, or any filter_map, run in one function from _compile_pipeline
+    """
+    if len(ops) <= _NESTED_STAGES_MAX and all(kind != "filter_map" for kind, _ in ops):
+        for kind, func in ops:
+            source = map(func, source) if kind == "map" else filter(func, source)
+        return source
+    run = _compile_pipeline(tuple(kind for kind, _ in ops))
+    return run(source, *(func for _, func in ops))
+
+
+_JIT_CHUNK = 1 << 16
+"""Number of count() values a jit() kernel produces, every one checked against the Python stages"""
+
+
+def _jit_kernel(
+    ops: tuple[tuple[str, typing.Callable], ...], start: int, step: int
+) -> tuple[typing.Callable, typing.Any]:
+    """Generate and compile a numba kernel running the map/filter stages over count() values.
+
+    kernel(start, step, out) fills out with the results for len(out) consecutive values
+    and returns how many passed the filters. Also returns the dtype out must have
+    """
+    np = _numpy()
+    numba = _numba()
+    stages = {}
+    maps = []
+    body = []
+    for index, (kind, func) in enumerate(ops):
+        if kind not in ("map", "filter"):
+            raise TypeError(f"cannot compile a {kind} stage")
+        name = f"f{index}"
+        stages[name] = numba.njit(func)
+        if kind == "map":
+            maps.append(f"x = {name}(x)")
+            body.append(f"x = {name}(x)")
+        else:
+            body.append(f"if not {name}(x): continue")
+
+    source = textwrap.dedent("""
+        def probe(x):
+            {maps}
+            return x
+
+        def kernel(start, step, out):
+            produced = 0
+            for i in range(out.shape[0]):
+                x = start + i * step
+                {body}
+                out[produced] = x
+                produced += 1
+            return produced
+        """).format(
+        maps="\n    ".join(maps) or "pass",
+        body="\n        ".join(body),
+    )
+    namespace = dict(stages)
+    exec(source, namespace)
+
+    # the maps decide the element type, filters only drop elements
+    sample = numba.njit(namespace["probe"])(start)
+    if isinstance(sample, (bool, np.bool_)):
+        dtype = np.bool_
+    elif isinstance(sample, (int, np.integer)):
+        dtype = np.int64
+    elif isinstance(sample, (float, np.floating)):
+        dtype = np.float64
+    else:
+        raise TypeError(f"cannot store {type(sample).__name__} results in an array")
+
+    kernel = numba.njit(namespace["kernel"])
+    # compile now so failures fall back
+    kernel(start, step, np.empty(1, dtype=dtype))
+    return kernel, dtype
+
+
+_JIT_INT_LIMIT = 2**53
+"""Magnitude count() values and int results of a jit() kernel must stay below, far from int64 wraparound"""
+
+
+def _same_values(results: list, expected: list) -> bool:
+    """Whether two lists hold equal values of exactly the same types"""
+    return len(results) == len(expected) and all(
+        type(x) is type(y) and x == y for x, y in zip(results, expected)
+    )
+
+
+def _jit_chunk(
+    kernel: typing.Callable,
+    ops: list[tuple[str, typing.Callable]],
+    start: int,
+    step: int,
+    out: typing.Any,
+) -> list | None:
+    """Run one chunk of a jit() kernel and return its results as Python values.
+
+    Returns None when the chunk cannot be trusted to match running the stages in Python:
+    values near the int64 range, or any result differing from the Python pipeline
+    """
+    last = start + (_JIT_CHUNK - 1) * step
+    if max(abs(start), abs(last)) >= _JIT_INT_LIMIT:
+        return None
+    produced = kernel(start, step, out)
+    results = out[:produced].tolist()
+    if (
+        out.dtype.kind == "i"
+        and results
+        and max(max(results), -min(results)) >= _JIT_INT_LIMIT
+    ):
+        return None
+    expected = list(_pipeline(iter(range(start, last + step, step)), ops))
+    return results if _same_values(results, expected) else None
+
+
 def requires_finite(error_message: str | None = None):
     """Decorator for methods that do not work on iterators of infinite size/unbounded"""
 
@@ -40,6 +225,161 @@ def requires_finite(error_message: str | None = None):
     return decorator
 
 
+_NUMPY_SORT_MIN = 4096
+"""Smallest list of ints sort() hands to numpy, below this the conversion costs more than it saves"""
+
+_WHEEL = (1, 7, 11, 13, 17, 19, 23, 29)
+"""Residues mod 30 coprime to 30, the only candidates the sieve stores"""
+
+_SEGMENT_BYTES = 256 * 1024
+"""Bitmap size of a full sieve segment, each byte holds the 8 wheel residues of 30 numbers"""
+
+_FIRST_SEGMENT_BYTES = 1 << 10
+"""Bitmap size of the first sieve segment, segments double in size up to _SEGMENT_BYTES"""
+
+_BYTE_OFFSETS = tuple(
+    tuple(w for bit, w in enumerate(_WHEEL) if byte >> bit & 1) for byte in range(256)
+)
+"""For each bitmap byte value, the offsets from the byte's first number of the set bits"""
+
+_CLEAR_BIT = tuple(bytes(byte & ~(1 << bit) for byte in range(256)) for bit in range(8))
+"""Translation tables clearing a single bit of every byte"""
+
+
+def _small_primes(limit: int) -> list[int]:
+    """Return all primes from 7 up to limit using a simple sieve of Eratosthenes"""
+    sieve = bytearray([1]) * limit
+    for p in range(3, math.isqrt(limit - 1) + 1, 2):
+        if sieve[p]:
+            sieve[p * p :: 2 * p] = bytes(len(range(p * p, limit, 2 * p)))
+    return list(itertools.compress(range(7, limit, 2), sieve[7::2]))
+
+
+def _wheel_offsets(p: int, low: int) -> list[int]:
+    """Return, for each wheel bit, the byte offset from low of the first multiple of p to clear.
+
+    Multiples p * m landing on one wheel residue have m in a single class mod 30,
+    so from there on they are exactly p bytes apart. Sieving starts at p * p
+    """
+    inverse = pow(p, -1, 30)
+    return [(p * (p + (w * inverse - p) % 30) - low) // 30 for w in _WHEEL]
+
+
+@functools.cache
+def _sieve_kernel():
+    """Return the numba compiled sieving loop, or None when numba is not installed.
+
+    Does the same as _sieve_segment, over a uint8 bitmap and int64 arrays of
+    primes and (n, 8) offsets
+    """
+    numba = _numba()
+    if numba is None:
+        return None
+
+    @numba.njit(cache=True, boundscheck=False)
+    def sieve_kernel(bitmap, primes, offsets):
+        size = bitmap.shape[0]
+        for i in range(primes.shape[0]):
+            p = primes[i]
+            for bit in range(8):
+                mask = 0xFF ^ (1 << bit)
+                q = offsets[i, bit]
+                while q < size:
+                    bitmap[q] &= mask
+                    q += p
+                offsets[i, bit] = q - size
+
+    return sieve_kernel
+
+
+def _sieve_segment(
+    bitmap: bytearray, primes: list[int], offsets: list[list[int]]
+) -> None:
+    """Clear the multiples of each prime from bitmap, starting at its wheel offsets.
+
+    The offsets are updated in place to where each prime continues in the next segment.
+    Each wheel bit of each prime is cleared with one strided slice translation
+    """
+    size = len(bitmap)
+    for p, starts in zip(primes, offsets):
+        for bit, q in enumerate(starts):
+            if q < size:
+                bitmap[q::p] = bitmap[q::p].translate(_CLEAR_BIT[bit])
+                starts[bit] = (q - size) % p
+            else:
+                starts[bit] = q - size
+
+
+def _sieve_segments() -> typing.Iterator[tuple[int, bytearray]]:
+    """Yield (low, bitmap) for consecutive segments of the natural numbers from 0.
+
+    Bit b of byte k of a segment's bitmap is set when low + 30k + _WHEEL[b] is prime,
+    2, 3 and 5 are not represented. Once segments reach _SEGMENT_BYTES they are sieved
+    with the numba kernel when it is available, keeping the primes and their offsets
+    in int64 arrays from then on. Smaller segments stay in Python, importing numba
+    costs more than sieving them
+    """
+    kernel = None
+    base: list[int] = []
+    base_limit = 0
+    sieving = 0  # how many of the base primes are in use
+    primes: typing.Any = []
+    offsets: typing.Any = []
+    low = 0
+    size = _FIRST_SEGMENT_BYTES
+    while True:
+        if kernel is None and size == _SEGMENT_BYTES:
+            kernel = _sieve_kernel()
+            if kernel is not None:
+                np = _numpy()
+                primes = np.array(primes, dtype=np.int64)
+                offsets = np.array(offsets, dtype=np.int64).reshape(-1, 8)
+
+        high = low + 30 * size
+        root = math.isqrt(high - 1)
+        if root >= base_limit:
+            base_limit = 2 * root + 1
+            base = _small_primes(base_limit)
+
+        # start sieving with every prime whose square falls into this segment, p * p < high
+        new = base[sieving : bisect.bisect_right(base, root)]
+        if new:
+            sieving += len(new)
+            rows = [_wheel_offsets(p, low) for p in new]
+            if kernel is None:
+                primes.extend(new)
+                offsets.extend(rows)
+            else:
+                primes = np.concatenate((primes, np.array(new, dtype=np.int64)))
+                offsets = np.concatenate((offsets, np.array(rows, dtype=np.int64)))
+
+        bitmap = bytearray(b"\xff") * size
+        if low == 0:
+            bitmap[0] &= 0xFE  # 1 is not prime
+        if kernel is None:
+            _sieve_segment(bitmap, primes, offsets)
+        else:
+            kernel(np.frombuffer(bitmap, dtype=np.uint8), primes, offsets)
+
+        yield low, bitmap
+        low = high
+        size = min(2 * size, _SEGMENT_BYTES)
+
+
+class _Source:
+    """Which sequence an untouched source iterator produces, for shortcuts that skip iterating it.
+
+    Shared by every Iter reading from the same iterator, consuming it through any of them
+    clears kind for all of them
+    """
+
+    __slots__ = ("kind", "args")
+
+    def __init__(self, kind: str, args: tuple):
+        self.kind: str | None = kind
+        self.args = args
+
+
 class Iter[T]:
     """
     rust like iterator wrapper.
@@ -54,95 +394,148 @@ class Iter[T]:
     def __init__(self, iterable: typing.Iterable[T], infinite: bool = False):
         self._iter = iter(iterable)
         self._infinite = infinite
+        self._ops: list[tuple[str, typing.Callable]] = []
+        self._source: _Source | None = None
 
     def __iter__(self):
+        if self._source is not None:
+            self._source.kind = None
+            self._source = None
+        if self._ops:
+            self._iter = _pipeline(self._iter, self._ops)
+            self._ops = []
         return self._iter
 
+    def _apply(
+        self, op: typing.Callable[[typing.Any, typing.Any], typing.Any], other
+    ) -> Iter:
+        """Apply op element-wise with another Iter, or with a scalar broadcast to every element"""
+        others = other if isinstance(other, Iter) else itertools.repeat(other)
+        return Iter(map(op, self, others))
+
     def __add__(self, other) -> Iter[T]:
-        if isinstance(other, Iter):
-            return self.zip(other).map(lambda pair: pair[0] + pair[1])
-        else:
-            return self.map(lambda x: x + other)
+        return self._apply(operator.add, other)
 
     def __sub__(self, other) -> Iter[T]:
-        if isinstance(other, Iter):
-            return self.zip(other).map(lambda pair: pair[0] - pair[1])
-        else:
-            return self.map(lambda x: x - other)
+        return self._apply(operator.sub, other)
 
     def __mul__(self, other) -> Iter[T]:
-        if isinstance(other, Iter):
-            return self.zip(other).map(lambda pair: pair[0] * pair[1])
-        else:
-            return self.map(lambda x: x * other)
+        return self._apply(operator.mul, other)
 
     def __truediv__(self, other) -> Iter[T]:
-        if isinstance(other, Iter):
-            return self.zip(other).map(lambda pair: pair[0] / pair[1])
-        else:
-            return self.map(lambda x: x / other)
+        return self._apply(operator.truediv, other)
 
     def __pow__(self, other) -> Iter[T]:
-        if isinstance(other, Iter):
-            return self.zip(other).map(lambda pair: pair[0] ** pair[1])
-        else:
-            return self.map(lambda x: x**other)
+        return self._apply(operator.pow, other)
 
     def __next__(self) -> T:
+        if self._ops or self._source is not None:
+            iter(self)
         return next(self._iter)
 
+    def _tagged(self, kind: str) -> tuple | None:
+        """Return the arguments of the source sequence if it is still an untouched kind, else None"""
+        source = self._source
+        if source is not None and source.kind == kind:
+            return source.args
+        return None
+
     def __getitem__(self, index) -> T | None:
-        for i in self.enumerate():
-            if i[0] == index:
-                return i[1]
+        """Return the element at index, or None when there is none.
+
+        Consumes the iterator up to and including that element, except on an untouched
+        Iter.fibonacci(), which is indexed by fast doubling and left where it was
+        """
+        seed = self._tagged("fib")
+        if seed is not None and not self._ops and isinstance(index, int) and index >= 0:
+            a, b = seed
+            f, g = _fib_pair(index)
+            return a * (g - f) + b * f
+
+        if index < 0:
+            return None
+        return next(itertools.islice(iter(self), index, index + 1), None)
 
     def __str__(self) -> str:
-        text = ""
-        for i in self.enumerate():
-            text += str(i[0]).ljust(3)
-            text += "|  "
-            text += str(i[1])
-            text += "\n"
-            if i[0] >= 10:
-                text += "..."
-                break
-        return text
+        lines = [
+            f"{index:<3}|  {value}\n"
+            for index, value in enumerate(itertools.islice(iter(self), 11))
+        ]
+        if len(lines) > 10:
+            lines.append("...")
+        return "".join(lines)
 
     def __len__(self) -> int:
         if self._infinite:
             return -1
-        else:
-            total = 0
-            for i in self.enumerate():
-                total = i[0]
-            return total
+        iterator = iter(self)
+        # sized sources (list, tuple, range, ...) report their remaining length without consuming
+        hint = operator.length_hint(iterator, -1)
+        if hint >= 0:
+            return hint
+        return sum(1 for _ in iterator)
 
     def len(self) -> int:
         return self.__len__()
 
+    def _with_op(self, kind: str, func: typing.Callable) -> Iter:
+        """Return a new Iter over the same source with one more stage added to the pipeline.
+
+        Consecutive map/filter/filter_map stages are combined by _pipeline when iterated
+        """
+        new = Iter(self._iter)
+        new._ops = [*self._ops, (kind, func)]
+        new._source = self._source
+        return new
+
     def map[U](self, func: typing.Callable[[T], U]) -> Iter[U]:
         """Map each element through a function"""
 
-        return Iter(map(func, self._iter))
+        return self._with_op("map", func)
 
     def filter(self, predicate: typing.Callable[[T], bool]) -> Iter[T]:
         """Filter elements using a predicate"""
-        return Iter(filter(predicate, self._iter))
+        return self._with_op("filter", predicate)
 
     def filter_map[U](self, func: typing.Callable[[T], U | None]) -> Iter[U]:
         """Filter and map in one step."""
 
-        def gen():
-            for item in self._iter:
-                result = func(item)
-                if result is not None:
-                    yield result
+        return self._with_op("filter_map", func)
 
-        return Iter(gen())
+    def jit(self) -> Iter[T]:
+        """Compile the map/filter stages over a count() into a single numba kernel.
+
+        The stages must be numeric functions numba can compile. They run with fixed width
+        int64/float64 arithmetic, which wraps around instead of growing, so the kernel only
+        produces the first chunk of _JIT_CHUNK values, after checking every one of them
+        against the Python stages, and values must stay within _JIT_INT_LIMIT. Matching one
+        range of values says nothing about the next, so iteration carries on in Python.
+        Returns self unchanged when numba is missing or the pipeline cannot be compiled
+        """
+        counter = self._tagged("count")
+        if counter is None or not self._ops or _numba() is None:
+            return self
+        start, step = counter
+        ops = list(self._ops)
+        np = _numpy()
+        try:
+            kernel, dtype = _jit_kernel(tuple(ops), start, step)
+            first = _jit_chunk(
+                kernel, ops, start, step, np.empty(_JIT_CHUNK, dtype=dtype)
+            )
+        except Exception:
+            return self
+        if first is None:
+            return self
+        # the kernel takes over the counter from every Iter sharing it
+        self._source.kind = None
+
+        rest = itertools.count(start + _JIT_CHUNK * step, step)
+        return Iter(itertools.chain(first, _pipeline(rest, ops)), self._infinite)
 
     def enumerate(self, start: int = 0) -> Iter[tuple[int, T]]:
         """Return a list of tuples of elements with indices"""
-        return Iter(enumerate(self._iter, start))
+        return Iter(enumerate(iter(self), start))
 
     def chain(self, *iterables: typing.Iterable) -> Iter:
         """Returns a new iterator with the other items added"""
@@ -158,19 +551,15 @@ class Iter[T]:
 
     def zip(self, *iterables: typing.Iterable) -> Iter[tuple]:
         """Zip with other iterables"""
-        return Iter(zip(self._iter, *iterables))
+        return Iter(zip(iter(self), *iterables))
 
     def take(self, items: int) -> Iter[T]:
         """Return a new iterable from the first `items` items from self"""
-
-        def gen():
-            for i in self.enumerate():
-                if i[0] >= items:
-                    break
-                else:
-                    yield i[1]
-
-        return Iter(gen())
+        repeated = self._tagged("repeat")
+        if repeated is not None and not self._ops and items >= 0:
+            (value,) = repeated
+            return Iter(itertools.repeat(value, items))
+        return Iter(itertools.islice(iter(self), max(items, 0)))
 
     def take_while(self, predicate: typing.Callable[[T], bool]) -> Iter[T]:
         def gen():
@@ -214,7 +603,7 @@ class Iter[T]:
             seen = []
             emitted = set()
 
-            for item in self._iter:
+            for item in iter(self):
                 seen.append(item)
 
                 # Generate new combinations with this element
@@ -231,7 +620,7 @@ class Iter[T]:
             seen = []
             emitted = set()
 
-            for item in self._iter:
+            for item in iter(self):
                 seen.append(item)
 
                 # Generate new combinations with this element
@@ -250,7 +639,7 @@ class Iter[T]:
             seen = []
             emitted = set()
 
-            for item in self._iter:
+            for item in iter(self):
                 seen.append(item)
                 perm_len = length if length is not None else len(seen)
                 if len(seen) >= perm_len:
@@ -265,7 +654,7 @@ class Iter[T]:
         """Generate pairs of elements"""
 
         def gen():
-            iterator = iter(self._iter)
+            iterator = iter(self)
             try:
                 prev = next(iterator)
             except StopIteration:
@@ -279,18 +668,37 @@ class Iter[T]:
 
     @requires_finite()
     def sum(self: Iter[SupportsSum]) -> SupportsSum | typing.Literal[0]:
-        return sum(self._iter)
+        return sum(iter(self))
 
     @requires_finite()
     def sort(
         self: Iter[SupportsRichComparison], key: None = None, reverse: bool = False
     ) -> Iter:
         """Returns a new iterator sorted"""
-        return Iter(sorted(self, key=key, reverse=reverse))
+        items = list(iter(self))
+        np = _numpy()
+        if (
+            np is not None
+            and key is None
+            and len(items) >= _NUMPY_SORT_MIN
+            and set(map(type, items)) == {int}
+        ):
+            array = np.array(items)
+            # ints beyond 64 bits give an object array, leave those to list.sort
+            if array.dtype.kind in "iu":
+                array.sort()
+                return Iter((array[::-1] if reverse else array).tolist())
+        items.sort(key=key, reverse=reverse)
+        return Iter(items)
 
     @requires_finite()
     def collect(self) -> list[T]:
-        return list(self)
+        return list(iter(self))
+
+    @requires_finite()
+    def collect_bytes(self: Iter[int]) -> bytes:
+        """Collect an iterator of ints in range(256) into bytes"""
+        return bytes(iter(self))
 
     @staticmethod
     def range(*args) -> Iter[int]:
@@ -299,7 +707,10 @@ class Iter[T]:
 
     @staticmethod
     def count(start: int = 0, step: int = 1) -> Iter[int]:
-        return Iter(itertools.count(start, step), infinite=True)
+        counter = Iter(itertools.count(start, step), infinite=True)
+        if isinstance(start, int) and isinstance(step, int):
+            counter._source = _Source("count", (start, step))
+        return counter
 
     @staticmethod
     def cycle(iterable: typing.Iterable[T]) -> Iter[T]:
@@ -311,15 +722,25 @@ class Iter[T]:
         if times:
             return Iter(itertools.repeat(value, times))
         else:
-            return Iter(itertools.repeat(value), infinite=True)
+            repeater = Iter(itertools.repeat(value), infinite=True)
+            repeater._source = _Source("repeat", (value,))
+            return repeater
 
     @staticmethod
     def squares(start: int = 0) -> Iter[int]:
-        return Iter.count(start) ** 2
+        def gen():
+            for n in itertools.count(start):
+                yield n * n
+
+        return Iter(gen(), infinite=True)
 
     @staticmethod
     def cubes(start: int = 0) -> Iter[int]:
-        return Iter.count(start) ** 3
+        def gen():
+            for n in itertools.count(start):
+                yield n * n * n
+
+        return Iter(gen(), infinite=True)
 
     @staticmethod
     def fibonacci(a: int = 1, b: int = 1) -> Iter[int]:
@@ -330,7 +751,19 @@ class Iter[T]:
                 yield a
                 a, b = b, a + b
 
-        return Iter(gen(), infinite=True)
+        fib = Iter(gen(), infinite=True)
+        fib._source = _Source("fib", (a, b))
+        return fib
+
+    @staticmethod
+    def nth_fibonacci(n: int) -> int:
+        """Return the nth Fibonacci number F(n), with F(0) = 0 and F(1) = 1.
+
+        Uses fast doubling, O(log n) multiplications, without iterating the sequence
+        """
+        if n < 0:
+            raise ValueError("n must be non-negative")
+        return _fib_pair(n)[0]
 
     @staticmethod
     def triangle_numbers() -> Iter[int]:
@@ -348,28 +781,41 @@ class Iter[T]:
 
     @staticmethod
     def primes() -> Iter[int]:
-        """Prime numbers"""
+        """Prime numbers, generated by a segmented mod-30 wheel sieve of Eratosthenes"""
 
         def gen():
-            yield 2
-            primes = [2]
-            candidate = 3
-            while True:
-                is_prime = True
-                for p in primes:
-                    if p * p > candidate:
-                        break
-
-                    if candidate % p == 0:
-                        is_prime = False
-                        break
-                if is_prime:
-                    primes.append(candidate)
-                    yield candidate
-                candidate += 2
+            yield from (2, 3, 5)
+            for low, bitmap in _sieve_segments():
+                for index, byte in enumerate(bitmap):
+                    if byte:
+                        base = low + 30 * index
+                        for offset in _BYTE_OFFSETS[byte]:
+                            yield base + offset
 
         return Iter(gen(), infinite=True)
 
+    @staticmethod
+    def primes_count(upto: int) -> int:
+        """Return how many primes are less than or equal to upto.
+
+        Runs the same sieve as primes() but counts each segment with a popcount
+        instead of yielding its primes
+        """
+        total = sum(1 for p in (2, 3, 5) if p <= upto)
+        for low, bitmap in _sieve_segments():
+            if low + 30 * len(bitmap) <= upto:
+                total += int.from_bytes(bitmap).bit_count()
+                continue
+
+            # last segment: whole bytes below upto, then the wheel bits of the byte holding it
+            full = max(0, (upto + 1 - low) // 30)
+            total += int.from_bytes(bitmap[:full]).bit_count()
+            if full < len(bitmap):
+                remainder = upto - low - 30 * full
+                mask = sum(1 << bit for bit, w in enumerate(_WHEEL) if w <= remainder)
+                total += (bitmap[full] & mask).bit_count()
+            return total
+
     @staticmethod
     def factorials() -> Iter[int]:
         """Factorial numbers"""
@@ -397,4 +843,9 @@ class Iter[T]:
     @staticmethod
     def nth_powers(n: int) -> Iter[int]:
         """Return the natural numbers raised to the power of n"""
-        return Iter.count() ** n
+
+        def gen():
+            for i in itertools.count():
+                yield i**n
+
+        return Iter(gen(), infinite=True)
@@ -0,0 +1,313 @@
+import random
+
+import pytest
+
+from infiniter import Iter
+from infiniter import iter as iter_module
+from infiniter.iter import InfiniteIteratorError
+
+
+def double(x):
+    return x * 2
+
+
+def odd(x):
+    return x % 2 == 1
+
+
+def halve_even(x):
+    return x // 2 if x % 2 == 0 else None
+
+
+def run_stages(stages, values):
+    """Apply stages one element at a time, the way the unfused methods did"""
+    results = []
+    for x in values:
+        for kind, func in stages:
+            if kind == "map":
+                x = func(x)
+            elif kind == "filter":
+                if not func(x):
+                    break
+            else:
+                x = func(x)
+                if x is None:
+                    break
+        else:
+            results.append(x)
+    return results
+
+
+def build(stages):
+    it = Iter.range(50)
+    for kind, func in stages:
+        it = getattr(it, kind)(func)
+    return it
+
+
+@pytest.mark.parametrize(
+    "stages",
+    [
+        [("map", double)],
+        [("filter", odd)],
+        [("filter_map", halve_even)],
+        [("map", double), ("filter", odd)],
+        [("filter", odd), ("map", double)],
+        [("map", str), ("map", len)],
+    ],
+)
+def test_pipeline_applies_stages_in_order(stages):
+    assert build(stages).collect() == run_stages(stages, range(50))
+
+
+@pytest.mark.parametrize(
+    "stages",
+    [
+        [("map", double), ("filter_map", halve_even), ("filter", odd)],
+        [("filter", odd), ("map", double), ("map", double), ("filter_map", halve_even)],
+        [("map", double)] * 3 + [("filter", odd)] * 2,
+        [("filter_map", halve_even), ("filter_map", halve_even)],
+    ],
+)
+def test_generated_pipeline_applies_stages_in_order(stages):
+    assert build(stages).collect() == run_stages(stages, range(50))
+
+
+def test_filter_map_keeps_falsy_values():
+    assert Iter([0, 1, 2, 3]).filter_map(lambda x: x % 2 == 0).collect() == [
+        True,
+        False,
+        True,
+        False,
+    ]
+    assert Iter([1, 2, 3]).filter_map(lambda x: None if x == 2 else 0).collect() == [
+        0,
+        0,
+    ]
+
+
+def test_pipeline_is_lazy_and_shares_source():
+    seen = []
+    it = Iter.count().map(lambda x: seen.append(x) or x).filter(odd)
+    assert seen == []
+    assert it.take(2).collect() == [1, 3]
+    assert seen == [0, 1, 2, 3]
+
+
+def test_fibonacci_indexing_matches_iteration():
+    for a, b in [(1, 1), (0, 1), (2, 1), (5, -3)]:
+        expected = Iter.fibonacci(a, b).take(80).collect()
+        assert [Iter.fibonacci(a, b)[i] for i in range(80)] == expected
+
+
+def test_fibonacci_indexing_does_not_consume():
+    fib = Iter.fibonacci()
+    assert fib[5] == 8
+    assert next(fib) == 1
+
+    numbers = Iter.range(10)
+    assert numbers[5] == 5
+    assert next(numbers) == 6
+
+
+def test_fibonacci_indexing_after_next_falls_back_to_iteration():
+    fib = Iter.fibonacci()
+    next(fib)
+    assert fib[0] == 1
+    assert fib[2] == 5
+
+
+def test_index_and_take():
+    assert Iter([1, 2, 3])[1] == 2
+    assert Iter([1, 2, 3])[-1] is None
+    assert Iter([1, 2, 3])[5] is None
+    assert Iter.range(10).take(3).collect() == [0, 1, 2]
+    assert Iter.range(10).take(-1).collect() == []
+
+
+def test_arithmetic_between_iters():
+    assert (Iter([1, 2, 3]) + Iter([10, 20, 30])).collect() == [11, 22, 33]
+    assert (Iter([1, 2, 3]) - Iter([10, 20, 30])).collect() == [-9, -18, -27]
+    assert (Iter([1, 2, 3]) * Iter([4, 5, 6])).collect() == [4, 10, 18]
+    assert (Iter([1, 2, 3]) / Iter([2, 4, 6])).collect() == [0.5, 0.5, 0.5]
+    assert (Iter([2, 3, 4]) ** Iter([3, 2, 1])).collect() == [8, 9, 4]
+
+
+def test_arithmetic_with_scalar_keeps_operand_order():
+    assert (Iter.range(3) + 1).collect() == [1, 2, 3]
+    assert (Iter.range(3) - 1).collect() == [-1, 0, 1]
+    assert (Iter.range(3) * 3).collect() == [0, 3, 6]
+    assert (Iter.range(3) / 2).collect() == [0.0, 0.5, 1.0]
+    assert (Iter.range(3) ** 2).collect() == [0, 1, 4]
+
+
+def test_arithmetic_stops_at_shorter_iter():
+    assert (Iter.range(5) + Iter([10, 20])).collect() == [10, 21]
+    assert (Iter([10, 20]) - Iter.range(5)).collect() == [10, 19]
+    assert (Iter.count() * Iter([1, 2, 3])).collect() == [0, 2, 6]
+
+
+def test_powers():
+    assert Iter.squares().take(5).collect() == [0, 1, 4, 9, 16]
+    assert Iter.squares(3).take(3).collect() == [9, 16, 25]
+    assert Iter.cubes().take(5).collect() == [0, 1, 8, 27, 64]
+    assert Iter.cubes(2).take(2).collect() == [8, 27]
+    assert Iter.nth_powers(4).take(4).collect() == [0, 1, 16, 81]
+
+
+@pytest.mark.parametrize(
+    "powers", [Iter.squares, Iter.cubes, lambda: Iter.nth_powers(2)]
+)
+def test_powers_are_infinite(powers):
+    with pytest.raises(InfiniteIteratorError):
+        powers().collect()
+
+
+def test_len_returns_number_of_elements():
+    assert Iter([1, 2, 3]).len() == 3
+    assert Iter([]).len() == 0
+    assert Iter.range(10).filter(odd).len() == 5
+    assert Iter(x for x in "abcd").len() == 4
+    assert Iter.count().take(7).len() == 7
+    assert Iter.count().len() == -1
+
+
+@pytest.fixture(params=["list", "numpy"])
+def sorter(request, monkeypatch):
+    """Run the test once with list.sort only and once with numpy allowed"""
+    if request.param == "list":
+        monkeypatch.setattr(iter_module, "_numpy", lambda: None)
+    elif iter_module._numpy() is None:
+        pytest.skip("numpy is not installed")
+    return request.param
+
+
+@pytest.mark.parametrize("reverse", [False, True])
+@pytest.mark.parametrize(
+    "low, high", [(-(2**63), 2**63 - 1), (2**63, 2**64 - 1), (0, 10)]
+)
+def test_sort_large_ints(sorter, reverse, low, high):
+    rng = random.Random(low)
+    items = [rng.randint(low, high) for _ in range(5000)]
+    result = Iter(items).sort(reverse=reverse).collect()
+    assert result == sorted(items, reverse=reverse)
+    assert set(map(type, result)) == {int}
+
+
+@pytest.mark.parametrize(
+    "extra", [2**64, -(2**63) - 1, 0.5, True], ids=["above", "below", "float", "bool"]
+)
+def test_sort_mixed_values_falls_back_to_list_sort(sorter, extra):
+    items = list(range(5000, 0, -1)) + [extra]
+    result = Iter(items).sort().collect()
+    assert result == sorted(items)
+    assert list(map(type, result)) == list(map(type, sorted(items)))
+
+
+def test_sort_bools_stay_bools(sorter):
+    items = [True, False] * 3000
+    result = Iter(items).sort(reverse=True).collect()
+    assert result == [True] * 3000 + [False] * 3000
+    assert all(type(x) is bool for x in result)
+
+
+def test_count_take_is_lazy_and_continues_counter():
+    counter = Iter.count(10, 5)
+    taken = counter.take(3)
+    assert next(counter) == 10
+    assert taken.collect() == [15, 20, 25]
+    assert next(counter) == 30
+
+
+def test_count_take_keeps_derived_iters_in_step():
+    counter = Iter.count()
+    doubled = counter.map(double)
+    assert counter.take(3).collect() == [0, 1, 2]
+    assert doubled.take(3).collect() == [6, 8, 10]
+
+
+@pytest.fixture
+def numba():
+    if iter_module._numba() is None:
+        pytest.skip("numba is not installed")
+
+
+def test_jit_matches_python(numba):
+    def pipeline():
+        return Iter.count().map(lambda x: x * 3 + 1).filter(lambda x: x % 7 == 0)
+
+    assert (
+        pipeline().jit().take(100_000).collect() == pipeline().take(100_000).collect()
+    )
+
+
+def test_jit_refuses_results_python_would_not_give(numba):
+    squares = Iter.count(2**40).map(lambda x: x * x)
+    assert squares.jit() is squares
+    assert squares.take(1).collect() == [2**80]
+
+    inverses = Iter.count().map(lambda x: x**-1 if x else 0.0)
+    assert inverses.jit() is inverses
+
+
+def test_jit_falls_back_once_values_grow(numba):
+    cubes = Iter.count().map(lambda x: x**3).jit().take(300_000).collect()
+    assert cubes == [x**3 for x in range(300_000)]
+
+
+def test_jit_after_source_advanced(numba):
+    counter = Iter.count()
+    doubled = counter.map(double)
+    next(counter)
+    next(counter)
+    assert doubled.jit().take(3).collect() == [4, 6, 8]
+
+
+def test_jit_does_not_trust_the_kernel_past_the_checked_values(numba):
+    # (x * x * x) wraps around int64 inside the filter from x = 2**21 on
+    def pipeline():
+        return Iter.count(2**21 - 65536).filter(lambda x: (x * x * x) % 7 == 0)
+
+    assert pipeline().jit().take(20_000).collect() == pipeline().take(20_000).collect()
+
+
+def test_jit_does_not_trust_chunks_without_results(numba):
+    # from x = 2**21 on the kernel shifts x << 42 into the int64 sign bit and drops whole chunks
+    def pipeline():
+        return Iter.count(2**21 - 65536).filter(lambda x: (x << 42) > 0)
+
+    assert pipeline().jit().take(70_000).collect() == pipeline().take(70_000).collect()
+
+
+def test_repeat_take():
+    assert Iter.repeat("a").take(3).collect() == ["a", "a", "a"]
+    assert Iter.repeat(7).take(0).collect() == []
+    assert Iter.repeat(7).take(-2).collect() == []
+    assert len(Iter.repeat(7).take(5)) == 5
+    assert Iter.repeat(1).map(double).take(2).collect() == [2, 2]
+
+
+def test_collect_bytes():
+    assert Iter([104, 105]).collect_bytes() == b"hi"
+    assert Iter.range(256).collect_bytes() == bytes(range(256))
+    assert Iter([]).collect_bytes() == b""
+
+
+@pytest.mark.parametrize("value", [-1, 256])
+def test_collect_bytes_rejects_values_outside_a_byte(value):
+    with pytest.raises(ValueError):
+        Iter([1, value]).collect_bytes()
+
+
+def test_collect_bytes_on_infinite_iter():
+    with pytest.raises(InfiniteIteratorError):
+        Iter.repeat(0).collect_bytes()
+
+
+def test_nth_fibonacci():
+    assert [Iter.nth_fibonacci(n) for n in range(12)] == [
+        0, 1, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89,
+    ]  # fmt: skip
+    assert Iter.nth_fibonacci(300) == Iter.fibonacci(0, 1).take(301).collect()[-1]
+    with pytest.raises(ValueError):
+        Iter.nth_fibonacci(-1)
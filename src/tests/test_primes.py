@@ -0,0 +1,68 @@
+import bisect
+import itertools
+
+import pytest
+
+from infiniter import Iter
+from infiniter import iter as iter_module
+
+# the tests cap segments at 4096 bytes, so the kernel takes over from the third segment on
+SEGMENT_BYTES = 4096
+LIMIT = 2_000_000
+BOUNDARIES = [30 * 1024 * (2**k - 1) for k in range(1, 4)] + [
+    30 * (7168 + SEGMENT_BYTES * k) for k in range(1, 4)
+]
+
+
+def simple_sieve(limit: int) -> list[int]:
+    sieve = bytearray([1]) * limit
+    sieve[:2] = b"\x00\x00"
+    for p in range(2, int(limit**0.5) + 1):
+        if sieve[p]:
+            sieve[p * p :: p] = bytes(len(range(p * p, limit, p)))
+    return list(itertools.compress(range(limit), sieve))
+
+
+REFERENCE = simple_sieve(LIMIT)
+
+
+@pytest.fixture(params=["python", "numba"])
+def kernel(request, monkeypatch):
+    """Run the test once with the pure Python sieve and once with the numba kernel"""
+    monkeypatch.setattr(iter_module, "_SEGMENT_BYTES", SEGMENT_BYTES)
+    if request.param == "python":
+        monkeypatch.setattr(iter_module, "_sieve_kernel", lambda: None)
+    elif iter_module._sieve_kernel() is None:
+        pytest.skip("numba is not installed")
+    return request.param
+
+
+def test_primes_matches_simple_sieve(kernel):
+    primes = Iter.primes().take(len(REFERENCE)).collect()
+    assert primes == REFERENCE
+
+
+def test_primes_starts_with_wheel_primes(kernel):
+    assert Iter.primes().take(10).collect() == [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
+
+
+@pytest.mark.parametrize(
+    "upto",
+    [-1, 0, 1, 2, 3, 4, 5, 6, 7, 29, 30, 31, 100]
+    + [boundary + k for boundary in BOUNDARIES for k in range(-3, 4)],
+)
+def test_primes_count(kernel, upto):
+    assert Iter.primes_count(upto) == bisect.bisect_right(REFERENCE, upto)
+
+
+def test_primes_count_known_value(kernel):
+    assert Iter.primes_count(10**7) == 664579
+
+
+def test_primes_below_full_segments_do_not_load_the_kernel(monkeypatch):
+    def kernel():
+        raise AssertionError("the kernel was loaded")
+
+    monkeypatch.setattr(iter_module, "_sieve_kernel", kernel)
+    assert Iter.primes().take(100_000).collect()[-1] == 1_299_709
+    assert Iter.primes_count(10**6) == 78498